@@ -0,0 +1,82 @@
+"""read-pdf 脚本共用：按页读取 PDF 自带的文本层，以及按页输出。"""
+
+import os
+import sys
+
+# 页数少于该值时串行提取，进程池启动开销不划算
+PARALLEL_MIN_PAGES = 16
+
+_READER = None
+
+
+def _extract_one(args):
+    """子进程内提取单页；每个进程只打开一次 PDF，避免共享可变状态。"""
+    global _READER
+    path, i = args
+    if _READER is None or _READER[0] != path:
+        from pypdf import PdfReader
+        _READER = (path, PdfReader(path))
+    return _READER[1].pages[i].extract_text() or ""
+
+
+def import_pymupdf():
+    """PyMuPDF ≥1.24.3 的模块名为 pymupdf，旧版只有 fitz；新版导入 fitz 会往 stdout 打印弃用警告，污染输出。"""
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    return pymupdf
+
+
+def _fitz_texts(path):
+    fitz = import_pymupdf()
+    with fitz.open(str(path)) as doc:
+        return [page.get_text("text") for page in doc]
+
+
+def _pdfminer_texts(path):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LAParams, LTTextContainer
+
+    laparams = LAParams(detect_vertical=False)
+    return ["".join(el.get_text() for el in page if isinstance(el, LTTextContainer))
+            for page in extract_pages(str(path), laparams=laparams)]
+
+
+def page_texts(path, workers=None):
+    """返回每页文本层组成的列表（无文本的页为空串）。
+
+    按 pymupdf → pdfminer.six → pypdf 的顺序取第一个已安装的解析器，都未安装时抛 ImportError。"""
+    for extract in (_fitz_texts, _pdfminer_texts):
+        try:
+            return extract(path)
+        except ImportError:
+            pass
+    return _pypdf_texts(path, workers)
+
+
+def _pypdf_texts(path, workers=None):
+    """pypdf 逐页解析为纯 Python 的 CPU 密集操作，页数较多时按进程池并行。"""
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(path))
+    n = len(reader.pages)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or n < PARALLEL_MIN_PAGES:
+        return [page.extract_text() or "" for page in reader.pages]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_extract_one, [(str(path), i) for i in range(n)], chunksize=8))
+
+
+def page_separator(i):
+    """第 i 页（从 0 起）之前的分隔符，已编码为字节；首页为空。"""
+    return b"\n--- Page %d ---\n\n" % (i + 1) if i else b""
+
+
+def write_output(chunks):
+    """把一批字节块合并为一次写出并立即 flush，避免逐页 print 的编码与加锁开销。"""
+    out = sys.stdout.buffer
+    out.write(b"".join(chunks))
+    out.flush()
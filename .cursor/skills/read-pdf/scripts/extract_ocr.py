@@ -1,22 +1,299 @@
 #!/usr/bin/env python3
 """对 PDF 做 OCR 提取文本并输出到 stdout。适用于扫描件/图片型 PDF。
-用法: python extract_ocr.py <path_to.pdf> [--lang LANG]
-依赖: pip install pdf2image pytesseract；系统需安装 poppler、tesseract 及中文包(chi_sim)。"""
+已带文本层的页直接输出文本，只对无文本的页做 OCR；--force-ocr 时忽略文本层、逐页 OCR。
+用法: python extract_ocr.py <path_to.pdf> [--lang LANG] [--workers N] [--dpi 150] [--psm 6] [--no-preprocess] [--force-ocr]
+依赖: pip install pymupdf pytesseract；系统需安装 tesseract 及中文包(chi_sim)。
+未安装 pymupdf 时回退为 pdf2image（需系统安装 poppler）；安装 tesserocr 时走进程内 API，免去逐页启动 tesseract。"""
 
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-def main():
-    args = [a for a in sys.argv[1:] if not a.startswith("--")]
-    lang = "chi_sim+eng"
-    if "--lang" in sys.argv:
-        i = sys.argv.index("--lang")
+# 多进程并行时 tesseract（OpenMP，默认每页最多 4 线程）与 numpy/pillow 可能用到的 BLAS 都只用单线程，
+# 否则 N 个进程 × 4 线程互相争抢 CPU，反而比串行更慢。须在导入 tesseract 相关模块之前设置。
+_SINGLE_THREAD_ENV = ("OMP_THREAD_LIMIT", "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def _pin_threads():
+    for key in _SINGLE_THREAD_ENV:
+        os.environ.setdefault(key, "1")
+
+
+_pin_threads()
+
+OPTIONS = ("--lang", "--workers", "--dpi", "--psm")
+
+# 文本层字符数达到该值的页视为数字页，跳过 OCR
+MIN_TEXT_CHARS = 100
+# 印刷体 150 DPI 灰度即可，像素量约为 200 DPI 彩色的 1/5
+DEFAULT_DPI = 150
+# 6 = 单一均匀文本块，跳过版面分析；3 = 全自动版面分析；11/12 = 稀疏文本（表单类扫描件）
+DEFAULT_PSM = 6
+PSM_CHOICES = (3, 4, 6, 11, 12)
+# 灰度标准差低于该值视为空白页，不进 LSTM
+BLANK_STDDEV = 5
+# 待 OCR 页数不超过该值时在主进程串行识别，省去进程池启动开销（每个子进程约 300ms）
+SERIAL_MAX_PAGES = 2
+
+
+def _installed(module):
+    from importlib.util import find_spec
+    return find_spec(module) is not None
+
+
+def _opt(name, default):
+    if name in sys.argv:
+        i = sys.argv.index(name)
         if i + 1 < len(sys.argv):
-            lang = sys.argv[i + 1]
+            return sys.argv[i + 1]
+    return default
+
+
+def _positional():
+    out, skip = [], False
+    for a in sys.argv[1:]:
+        if skip:
+            skip = False
+        elif a in OPTIONS:
+            skip = True
+        elif not a.startswith("--"):
+            out.append(a)
+    return out
+
+
+def _render_page(doc, idx, dpi):
+    """用 PyMuPDF 在进程内渲染单页为灰度图，免去 pdftoppm 子进程。"""
+    from PIL import Image
+    from _pdf_text import import_pymupdf
+    fitz = import_pymupdf()
+    pix = doc[idx].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+    return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+def _raise_nofile_limit(target=10000):
+    """pdftoppm 多线程渲染会同时打开大量临时文件，macOS 默认 256 的软上限容易触发 Too many open files。"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY:
+        target = min(target, hard)
+    if soft < target:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def _load_page(src, docs):
+    """src 为 (PDF 路径, 页序号, DPI) 时用 PyMuPDF 渲染（docs 缓存已打开的文档）；为字符串时读取 pdf2image 生成的图片并删除。"""
+    if isinstance(src, tuple):
+        path, idx, dpi = src
+        if path not in docs:
+            from _pdf_text import import_pymupdf
+            docs[path] = import_pymupdf().open(path)
+        return _render_page(docs[path], idx, dpi)
+    from PIL import Image
+    with Image.open(src) as img:
+        img.load()
+    os.unlink(src)
+    return img
+
+
+def _lang_works(lang):
+    """用 50×50 空白图试识别一次，确认该语言包真能加载。"""
+    from PIL import Image
+    img = Image.new("L", (50, 50), 255)
+    try:
+        try:
+            import tesserocr
+            tesserocr.image_to_text(img, lang=lang)
+        except ImportError:
+            import pytesseract
+            pytesseract.image_to_string(img, lang=lang)
+    except Exception:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def _resolve_lang(requested):
+    """在主进程确定一次可用语言：未安装 chi_sim 或试识别失败则整份文档改用 eng。子进程只接收结果，不再探测。"""
+    lang = requested
+    if "chi" in requested:
+        try:
+            try:
+                import tesserocr  # 直接读 tessdata 目录，无需启动 tesseract 进程
+                langs = tesserocr.get_languages()[1]
+            except ImportError:
+                import pytesseract
+                langs = pytesseract.get_languages()
+        except Exception:
+            langs = ()
+        if "chi_sim" not in langs:
+            lang = "eng"
+    if lang != "eng" and not _lang_works(lang):
+        lang = "eng"
+    return lang
+
+
+_API = None
+_LANG = "eng"
+_PSM = DEFAULT_PSM
+_PREPROCESS = True
+
+
+def _init_worker(lang, psm, preprocess):
+    """进程池初始化：记录已解析的语言、PSM 等参数；有 tesserocr 时每个子进程只创建一次 API，模型仅加载一次。"""
+    global _API, _LANG, _PSM, _PREPROCESS
+    _pin_threads()
+    _LANG, _PSM, _PREPROCESS = lang, psm, preprocess
+    try:
+        from tesserocr import OEM, PyTessBaseAPI
+    except ImportError:
+        return
+    _API = PyTessBaseAPI(lang=lang, oem=OEM.LSTM_ONLY, psm=psm)
+
+
+# 倾斜角小于该值（度）时不旋转
+DESKEW_MIN_ANGLE = 0.5
+
+
+def _preprocess(img):
+    """Otsu 二值化 + 纠偏，减少 tesseract 需处理的噪声。需 numpy 与 opencv-python-headless，未安装时原样返回。"""
+    try:
+        import cv2
+        import numpy as np
+    except ImportError:
+        return img
+    from PIL import Image
+    arr = np.asarray(img.convert("L"))
+    _, bw = cv2.threshold(arr, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    ys, xs = np.nonzero(bw < 255)
+    if len(xs) == 0:
+        return Image.fromarray(bw)
+    angle = cv2.minAreaRect(np.column_stack((xs, ys)).astype(np.float32))[-1]
+    # minAreaRect 的角度区间随 OpenCV 版本不同（[-90, 0) 或 (0, 90]），统一到 [-45, 45]
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    if abs(angle) > DESKEW_MIN_ANGLE:
+        h, w = bw.shape
+        m = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        bw = cv2.warpAffine(bw, m, (w, h), flags=cv2.INTER_NEAREST, borderValue=255)
+    return Image.fromarray(bw)
+
+
+def _is_blank(img):
+    from PIL import ImageStat
+    return ImageStat.Stat(img.convert("L")).stddev[0] < BLANK_STDDEV
+
+
+def _image_to_text(img):
+    if _API is not None:
+        _API.SetImage(img)
+        return _API.GetUTF8Text()
+    import pytesseract
+    # oem 1: 仅 LSTM，跳过传统引擎
+    return pytesseract.image_to_string(img, lang=_LANG, config=f"--psm {_PSM} --oem 1")
+
+
+def _ocr_page(src, docs):
+    """OCR 单页，空白页直接返回空串。"""
+    img = _load_page(src, docs)
+    if _is_blank(img):
+        return ""
+    if _PREPROCESS:
+        img = _preprocess(img)
+    return _image_to_text(img)
+
+
+def _ocr_chunk(tasks):
+    """子进程内顺序 OCR 一组页，tasks = [(页序号, 页面来源), ...]；PDF 在整组内只打开一次。"""
+    docs = {}
+    try:
+        return [(idx, _ocr_page(src, docs)) for idx, src in tasks]
+    finally:
+        for doc in docs.values():
+            doc.close()
+
+
+def _run(n_pages, tasks, workers, lang, psm, preprocess, known):
+    """按页序输出：known 中的页直接用文本层，其余页取 tasks 的 OCR 结果。
+
+    任一块完成即把已连续就绪的页写出，慢页不会拖住前面页的输出。"""
+    import math
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from _pdf_text import page_separator, write_output
+    # 按块派发摊薄每次任务的序列化/调度开销；块数约为进程数的 4 倍，兼顾负载均衡
+    size = max(1, math.ceil(len(tasks) / (4 * workers)))
+    blocks = [tasks[k:k + size] for k in range(0, len(tasks), size)]
+    done = dict(known)
+    next_page = 0
+
+    def emit():
+        nonlocal next_page
+        chunks = []
+        while next_page in done:
+            text = done.pop(next_page)
+            chunks.append(page_separator(next_page))
+            if text:
+                chunks.append(text.rstrip().encode("utf-8") + b"\n")
+            next_page += 1
+        if chunks:
+            write_output(chunks)
+
+    emit()
+    if workers == 1 or len(tasks) <= SERIAL_MAX_PAGES:
+        _init_worker(lang, psm, preprocess)
+        done.update(_ocr_chunk(tasks))
+        emit()
+        return
+
+    # Linux 上用 fork，子进程直接继承已导入的模块，无需重新 import
+    ctx = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(lang, psm, preprocess)) as ex:
+        futures = [ex.submit(_ocr_chunk, block) for block in blocks]
+        for fut in as_completed(futures):
+            done.update(fut.result())
+            emit()
+
+
+def _text_layer(path):
+    """返回 (文本层足够长的页 {页序号: 文本}, 总页数)；无可用解析器或解析失败时返回 ({}, None)。"""
+    try:
+        from _pdf_text import page_texts
+        texts = page_texts(path)
+    except Exception:
+        return {}, None
+    return {i: t for i, t in enumerate(texts) if len(t.strip()) >= MIN_TEXT_CHARS}, len(texts)
+
+
+def main():
+    args = _positional()
+    lang = _opt("--lang", "chi_sim+eng")
+    try:
+        workers = max(1, int(_opt("--workers", os.cpu_count() or 1)))
+        dpi = max(50, int(_opt("--dpi", DEFAULT_DPI)))
+        psm = int(_opt("--psm", DEFAULT_PSM))
+    except ValueError:
+        print("--workers / --dpi / --psm 需为正整数", file=sys.stderr)
+        sys.exit(1)
+    preprocess = "--no-preprocess" not in sys.argv
+    # 扫描件自带的文本层可能是乱码或不可见的旧 OCR 结果，此时需跳过文本层全部重新识别
+    force_ocr = "--force-ocr" in sys.argv
+    if psm not in PSM_CHOICES:
+        print(f"--psm 仅支持 {PSM_CHOICES}", file=sys.stderr)
+        sys.exit(1)
 
     if len(args) < 1:
-        print("用法: python extract_ocr.py <path_to.pdf> [--lang chi_sim+eng]", file=sys.stderr)
-        print("依赖: pip install pdf2image pytesseract; macOS: brew install poppler tesseract tesseract-lang", file=sys.stderr)
+        print("用法: python extract_ocr.py <path_to.pdf> [--lang chi_sim+eng] [--workers N] [--dpi 150] [--psm 6] [--no-preprocess] [--force-ocr]", file=sys.stderr)
+        print("依赖: pip install pymupdf pytesseract; macOS: brew install tesseract tesseract-lang", file=sys.stderr)
         sys.exit(1)
     path = Path(args[0]).resolve()
     if not path.exists():
@@ -26,42 +303,48 @@ def main():
         print("请提供 .pdf 文件", file=sys.stderr)
         sys.exit(1)
 
-    try:
-        from pdf2image import convert_from_path
-    except ImportError:
-        print("请先安装: pip install pdf2image", file=sys.stderr)
+    # 只检查是否已安装、不实际导入，出错路径毫秒级返回；各模块在真正用到时再导入
+    # 与 _pdf_text.import_pymupdf 一致：新版模块名为 pymupdf，旧版只有 fitz，任一可用即可
+    use_fitz = _installed("pymupdf") or _installed("fitz")
+    if not use_fitz and not _installed("pdf2image"):
+        print("请先安装: pip install pymupdf（或 pip install pdf2image 并安装 poppler）", file=sys.stderr)
         sys.exit(1)
-    try:
-        import pytesseract
-    except ImportError:
-        print("请先安装: pip install pytesseract", file=sys.stderr)
+    if not _installed("tesserocr") and not _installed("pytesseract"):
+        print("请先安装: pip install pytesseract（或 pip install tesserocr）", file=sys.stderr)
         sys.exit(1)
 
-    try:
-        images = convert_from_path(str(path), dpi=200)
-    except Exception as e:
-        print(f"PDF 转图片失败(需安装 poppler): {e}", file=sys.stderr)
-        sys.exit(1)
+    use_lang = _resolve_lang(lang)
+    print(f"OCR 语言: {use_lang}" + ("" if use_lang == lang else f"（{lang} 不可用，已回退）"), file=sys.stderr)
+    known, n_pages = ({}, None) if force_ocr else _text_layer(path)
 
-    # 若未安装 chi_sim 则仅用 eng
-    use_lang = lang
-    if "chi" in lang:
-        try:
-            langs = pytesseract.get_languages()
-            if "chi_sim" not in langs:
-                use_lang = "eng"
-        except Exception:
-            use_lang = "eng"
+    if use_fitz:
+        if n_pages is None:
+            from _pdf_text import import_pymupdf
+            try:
+                with import_pymupdf().open(str(path)) as doc:
+                    n_pages = doc.page_count
+            except Exception as e:
+                print(f"PDF 打开失败: {e}", file=sys.stderr)
+                sys.exit(1)
+        tasks = [(i, (str(path), i, dpi)) for i in range(n_pages) if i not in known]
+        _run(n_pages, tasks, workers, use_lang, psm, preprocess, known)
+        return
 
-    for i, img in enumerate(images):
-        if i > 0:
-            print("\n--- Page", i + 1, "---\n")
+    import tempfile
+    from pdf2image import convert_from_path
+    _raise_nofile_limit()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # 逐页写入临时 JPEG 并只返回路径，内存不随页数增长；子进程按路径读取
+        # pdftoppm 多线程渲染，留一个核给主进程
         try:
-            text = pytesseract.image_to_string(img, lang=use_lang)
-        except Exception:
-            text = pytesseract.image_to_string(img, lang="eng")
-        if text:
-            print(text.rstrip())
+            pages = convert_from_path(str(path), dpi=dpi, output_folder=tmpdir, paths_only=True,
+                                      fmt="jpeg", grayscale=True,
+                                      thread_count=max(1, (os.cpu_count() or 2) - 1))
+        except Exception as e:
+            print(f"PDF 转图片失败(需安装 poppler): {e}", file=sys.stderr)
+            sys.exit(1)
+        tasks = [(i, p) for i, p in enumerate(pages) if i not in known]
+        _run(len(pages), tasks, workers, use_lang, psm, preprocess, known)
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-"""从 PDF 提取文本并输出到 stdout。用法: python extract_text.py <path_to.pdf>"""
+"""从 PDF 提取文本并输出到 stdout。用法: python extract_text.py <path_to.pdf>
+依赖: pip install pymupdf（最快）；未安装时依次回退 pdfminer.six、pypdf。"""
 
 import sys
 from pathlib import Path
@@ -16,19 +17,19 @@ def main():
         print("请提供 .pdf 文件", file=sys.stderr)
         sys.exit(1)
 
+    from _pdf_text import page_separator, page_texts, write_output
     try:
-        from pypdf import PdfReader
+        texts = page_texts(path)
     except ImportError:
-        print("请先安装: pip install pypdf", file=sys.stderr)
+        print("请先安装: pip install pymupdf（或 pdfminer.six / pypdf）", file=sys.stderr)
         sys.exit(1)
 
-    reader = PdfReader(str(path))
-    for i, page in enumerate(reader.pages):
-        if i > 0:
-            print("\n--- Page", i + 1, "---\n")
-        text = page.extract_text()
+    chunks = []
+    for i, text in enumerate(texts):
+        chunks.append(page_separator(i))
         if text:
-            print(text, end="")
+            chunks.append(text.encode("utf-8"))
+    write_output(chunks)
 
 if __name__ == "__main__":
     main()
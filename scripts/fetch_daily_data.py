@@ -9,6 +9,7 @@ A股每日复盘数据自动采集脚本
     python3 scripts/fetch_daily_data.py --range 20260210 20260225 --summary  # 批量采集并生成汇总
     python3 scripts/fetch_daily_data.py --range 20260210 20260225 --force    # 强制重新采集（忽略缓存）
     python3 scripts/fetch_daily_data.py --print-only                         # 仅打印，不生成文件
+    python3 scripts/fetch_daily_data.py --quiet                              # 不打印控制台报告（定时任务用）
 
 数据源：AKShare（新浪 + 东方财富）
 已验证可用接口（2026-02）：
@@ -20,6 +21,8 @@ A股每日复盘数据自动采集脚本
   - stock_zt_pool_dtgc_em       跌停股池
   - stock_zt_pool_previous_em   昨日涨停股池
 
+历史交易日的股池接口结果缓存在 data/.cache/，重复采集同一日期时不再请求网络。
+
 故障排查：若在 macOS 上出现 exit 139（段错误）或 ModuleNotFoundError 等，见同目录 TROUBLESHOOTING.md。
 """
 
@@ -37,19 +40,31 @@ if sys.platform == "darwin":
     )
 
 import argparse
+import functools
 import json
+import threading
+import time
 import warnings
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
 import akshare as ak
+import numpy as np
 import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CACHE_DIR = DATA_DIR / ".cache"
 
 
 # ---------------------------------------------------------------------------
@@ -64,14 +79,14 @@ except ImportError:
     _HAS_XCALS = False
 
 
-def get_trading_days(start: str, end: str) -> list[str]:
-    """返回 [start, end] 范围内的 A 股交易日列表（YYYYMMDD 字符串）。"""
+@functools.lru_cache(maxsize=256)
+def _trading_days_cached(start: str, end: str) -> tuple[str, ...]:
     s = pd.Timestamp(start)
     e = pd.Timestamp(end)
     if _HAS_XCALS:
         try:
             sessions = _XSHG.sessions_in_range(s, e)
-            return [d.strftime("%Y%m%d") for d in sessions]
+            return tuple(d.strftime("%Y%m%d") for d in sessions)
         except Exception:
             pass
     if not _HAS_XCALS:
@@ -79,7 +94,14 @@ def get_trading_days(start: str, end: str) -> list[str]:
     else:
         print("  ⚠ 日期超出 exchange_calendars 范围，回退为工作日过滤")
     days = pd.bdate_range(s, e)
-    return [d.strftime("%Y%m%d") for d in days]
+    return tuple(d.strftime("%Y%m%d") for d in days)
+
+
+def get_trading_days(start: str, end: str) -> list[str]:
+    """返回 [start, end] 范围内的 A 股交易日列表（YYYYMMDD 字符串）。
+
+    同一区间的结果按 (start, end) 缓存在进程内，返回的列表可由调用方自由修改。"""
+    return list(_trading_days_cached(start, end))
 
 
 def get_recent_trading_days(n: int) -> list[str]:
@@ -94,48 +116,60 @@ def get_recent_trading_days(n: int) -> list[str]:
 # 情绪评分映射
 # ---------------------------------------------------------------------------
 
-def score_zt_count(n: int) -> float:
-    if n < 20: return max(1, n / 10)
-    if n < 40: return 3 + (n - 20) / 20 * 2
-    if n < 70: return 5 + (n - 40) / 30 * 2
-    if n < 100: return 7 + (n - 70) / 30 * 2
-    return min(10, 9 + (n - 100) / 50)
-
-def score_seal_rate(rate: float) -> float:
-    if rate < 40: return max(1, rate / 40 * 3)
-    if rate < 55: return 4 + (rate - 40) / 15
-    if rate < 70: return 6 + (rate - 55) / 15
-    if rate < 85: return 8 + (rate - 70) / 15
-    return min(10, 9 + (rate - 85) / 15)
-
-def score_premium(pct: float) -> float:
-    if pct < -5: return 1
-    if pct < -2: return 1 + (pct + 5) / 3 * 2
-    if pct < 0: return 4 + (pct + 2) / 2
-    if pct < 3: return 6 + pct / 3
-    if pct < 6: return 8 + (pct - 3) / 3
-    return min(10, 9 + (pct - 6) / 4)
-
-def score_max_streak(n: int) -> float:
-    mapping = {0: 1, 1: 2, 2: 3, 3: 5, 4: 7, 5: 7, 6: 8, 7: 8}
-    if n in mapping: return mapping[n]
-    return min(10, 9 + (n - 7) / 3)
-
-def score_rise_fall_ratio(ratio: float) -> float:
-    if ratio < 0.3: return 1
-    if ratio < 0.6: return 2 + (ratio - 0.3) / 0.3
-    if ratio < 1: return 4 + (ratio - 0.6) / 0.4 * 2
-    if ratio < 2: return 6 + (ratio - 1)
-    if ratio < 3: return 8 + (ratio - 2)
-    return min(10, 9 + (ratio - 3) / 2)
-
-def score_dt_count(n: int) -> float:
-    if n == 0: return 10
-    if n <= 5: return 8 + (5 - n) / 5
-    if n <= 10: return 6 + (10 - n) / 5 * 2
-    if n <= 20: return 4 + (20 - n) / 10 * 2
-    if n <= 30: return 2 + (30 - n) / 10
-    return 1
+def _piecewise_score(breaks, segments, *, side="right"):
+    """由分段线性表构造评分函数，结果截断到 [1, 10]。
+
+    breaks 为升序分界点；segments 为 len(breaks)+1 段 (x0, y0, 除数, 乘数)，第 i 段取值 y0 + (x - x0) / 除数 * 乘数。
+    side="right" 表示分界点归入右段（x < b），"left" 表示归入左段（x <= b）。
+    标量入参返回数值，数组入参整体向量化计算并返回 ndarray。
+    """
+    b = np.asarray(breaks, dtype=float)
+    x0, y0, div, mul = (np.array(col, dtype=float) for col in zip(*segments))
+
+    def score(x):
+        arr = np.asarray(x, dtype=float)
+        i = np.searchsorted(b, arr, side=side)
+        raw = y0[i] + (arr - x0[i]) / div[i] * mul[i]
+        # 常数段直接取 y0（避免 ±inf * 0 得 NaN）；NaN 入参落在最后一段，
+        # 与原 if 链比较全为 False、走到末尾 min(10, ...) 一致取 10
+        raw = np.where(mul[i] == 0, y0[i], np.where(np.isnan(arr), 10, raw))
+        out = np.clip(raw, 1, 10)
+        if out.ndim:
+            return out
+        # 常数段与截断值返回 int，保持写入 JSON / 草稿时 7 与 7.0 的区别
+        if mul[i] == 0 or (i == 0 and raw <= 1) or (i == len(b) and raw >= 10):
+            return int(out)
+        return float(out)
+    return score
+
+
+score_zt_count = _piecewise_score(
+    [20, 40, 70, 100],
+    [(0, 0, 10, 1), (20, 3, 20, 2), (40, 5, 30, 2), (70, 7, 30, 2), (100, 9, 50, 1)])
+
+score_seal_rate = _piecewise_score(
+    [40, 55, 70, 85],
+    [(0, 0, 40, 3), (40, 4, 15, 1), (55, 6, 15, 1), (70, 8, 15, 1), (85, 9, 15, 1)])
+
+score_premium = _piecewise_score(
+    [-5, -2, 0, 3, 6],
+    [(0, 1, 1, 0), (-5, 1, 3, 2), (-2, 4, 2, 1), (0, 6, 3, 1), (3, 8, 3, 1), (6, 9, 4, 1)])
+
+# 0~7 板查表（0→1, 1→2, 2→3, 3→5, 4/5→7, 6/7→8），8 板起每多 3 板加 1 分
+score_max_streak = _piecewise_score(
+    [1, 2, 3, 4, 5, 6, 7, 8],
+    [(0, v, 1, 0) for v in (1, 2, 3, 5, 7, 7, 8, 8)] + [(7, 9, 3, 1)])
+
+score_rise_fall_ratio = _piecewise_score(
+    [0.3, 0.6, 1, 2, 3],
+    [(0, 1, 1, 0), (0.3, 2, 0.3, 1), (0.6, 4, 0.4, 2), (1, 6, 1, 1), (2, 8, 1, 1), (3, 9, 2, 1)])
+
+# 跌停为反指：0 家 10 分，家数越多分越低；分界点归入左段（n <= 5 / 10 / 20 / 30）
+score_dt_count = _piecewise_score(
+    [0, 5, 10, 20, 30],
+    [(0, 10, 1, 0), (5, 8, 5, -1), (10, 6, 5, -2), (20, 4, 10, -2), (30, 2, 10, -1), (0, 1, 1, 0)],
+    side="left")
+
 
 def calc_emotion_score(zt_count, seal_rate, premium, max_streak, rf_ratio, dt_count):
     scores = {
@@ -151,79 +185,160 @@ def calc_emotion_score(zt_count, seal_rate, premium, max_streak, rf_ratio, dt_co
     total = sum(scores[k] * weights[k] for k in scores)
     return round(total, 2), {k: round(v, 1) for k, v in scores.items()}
 
+# 情绪阶段分界：得分 < 3 / 5 / 7 / 9 依次落入各阶段
+_STAGE_BREAKS = np.array([3, 5, 7, 9])
+_STAGE_LABELS = np.array(["冰点期", "退潮期", "回暖期", "高潮期", "亢奋期"])
+_STAGE_FULL = np.array([
+    "冰点期（1-3分）—— 极度低迷，空仓观望",
+    "退潮/修复期（3-5分）—— 亏钱效应为主，控仓关注转折",
+    "回暖/上升期（5-7分）—— 赚钱效应回归，跟随龙头",
+    "高潮期（7-9分）—— 赚钱效应强烈，注意见顶信号",
+    "极度亢奋（9-10分）—— 警惕退潮，开始防守",
+])
+
+
+def emotion_stages(scores) -> np.ndarray:
+    """整列得分一次映射为情绪阶段简称；缺失值（None）按 NaN 处理。"""
+    return _STAGE_LABELS[np.searchsorted(_STAGE_BREAKS, np.asarray(scores, dtype=float), side="right")]
+
+
 def emotion_stage(score: float) -> str:
-    if score < 3: return "冰点期"
-    if score < 5: return "退潮期"
-    if score < 7: return "回暖期"
-    if score < 9: return "高潮期"
-    return "亢奋期"
+    return str(emotion_stages(score))
 
 def emotion_stage_full(score: float) -> str:
-    if score < 3: return "冰点期（1-3分）—— 极度低迷，空仓观望"
-    if score < 5: return "退潮/修复期（3-5分）—— 亏钱效应为主，控仓关注转折"
-    if score < 7: return "回暖/上升期（5-7分）—— 赚钱效应回归，跟随龙头"
-    if score < 9: return "高潮期（7-9分）—— 赚钱效应强烈，注意见顶信号"
-    return "极度亢奋（9-10分）—— 警惕退潮，开始防守"
+    return str(_STAGE_FULL[np.searchsorted(_STAGE_BREAKS, np.asarray(score, dtype=float), side="right")])
 
 
 # ---------------------------------------------------------------------------
 # 数据采集
 # ---------------------------------------------------------------------------
 
+# 批量采集并发度与 AKShare 请求速率上限（次/秒），避免触发数据源限流
+BATCH_MAX_WORKERS = 4
+AKSHARE_MAX_RPS = 4.0
+
+
+class _RateLimiter:
+    """匀速限流：相邻两次请求的发起时间至少间隔 1/rate 秒，线程安全。"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+_akshare_limiter = _RateLimiter(AKSHARE_MAX_RPS)
+# 仅批量采集期间置位限流；单日模式只请求几个接口，不必等待
+_throttle = threading.Event()
+
+
 def _safe_fetch(name, fn):
+    if _throttle.is_set():
+        _akshare_limiter.wait()
     try:
         return fn()
     except Exception as e:
         print(f"  ⚠ {name} 获取失败: {e}")
         return pd.DataFrame()
 
+INDEX_CODES = [("sh000001", "上证指数"), ("sz399001", "深证成指"), ("sz399006", "创业板指")]
+
+
 def fetch_index_data() -> dict:
     """三大指数实时数据（新浪源）—— 仅单日模式使用"""
     df = ak.stock_zh_index_spot_sina()
-    target = {"sh000001": "上证指数", "sz399001": "深证成指", "sz399006": "创业板指"}
+    target = dict(INDEX_CODES)
+    codes = df["代码"].astype(str)
     result = {}
-    for _, row in df.iterrows():
-        code = str(row["代码"])
-        if code in target:
-            result[target[code]] = {
-                "收盘": round(float(row["最新价"]), 2),
-                "涨跌幅": round(float(row["涨跌幅"]), 2),
-                "成交额_亿": round(float(row["成交额"]) / 1e8, 0),
-            }
+    for row in df.loc[codes.isin(target.keys())].to_dict(orient="records"):
+        result[target[str(row["代码"])]] = {
+            "收盘": round(float(row["最新价"]), 2),
+            "涨跌幅": round(float(row["涨跌幅"]), 2),
+            "成交额_亿": round(float(row["成交额"]) / 1e8, 0),
+        }
     return result
 
-def fetch_index_hist(dates: list[str]) -> dict[str, dict]:
-    """批量获取指数历史数据，返回 {date_str: {name: {close, pct, volume}}}"""
-    result: dict[str, dict] = {}
-    for code, name in [("sh000001", "上证指数"), ("sz399001", "深证成指"), ("sz399006", "创业板指")]:
+def _index_daily(code: str, *, refresh: bool = False) -> pd.DataFrame:
+    """指数全量日线；接口每次返回十余年历史，当天已下载过则直接读 CACHE_DIR 中的副本。"""
+    path = CACHE_DIR / f"index_{code}.pkl"
+    if not refresh and path.exists() and \
+            datetime.fromtimestamp(path.stat().st_mtime).date() == datetime.now().date():
         try:
-            df = ak.stock_zh_index_daily(symbol=code)
-            df["date_str"] = pd.to_datetime(df["date"]).dt.strftime("%Y%m%d")
-            df = df.sort_values("date").reset_index(drop=True)
-            df["pct"] = df["close"].pct_change() * 100
-            df_filtered = df[df["date_str"].isin(dates)]
-            for _, row in df_filtered.iterrows():
-                d = row["date_str"]
-                if d not in result:
-                    result[d] = {}
-                result[d][name] = {
-                    "收盘": round(float(row["close"]), 2),
-                    "涨跌幅": round(float(row["pct"]), 2) if pd.notna(row["pct"]) else 0.0,
-                    "成交额_亿": round(float(row["volume"]) / 1e8, 0) if "volume" in row and row["volume"] else 0,
-                }
-        except Exception as e:
-            print(f"  ⚠ {name} 历史数据获取失败: {e}")
+            return pd.read_pickle(path)
+        except Exception:
+            pass
+    df = ak.stock_zh_index_daily(symbol=code)
+    if not df.empty:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        df.to_pickle(tmp)
+        tmp.replace(path)
+    return df
+
+
+def _fetch_one_index(code: str, dates: list[str], *, refresh: bool = False) -> dict[str, dict]:
+    """单个指数的历史数据，返回 {date_str: {收盘, 涨跌幅, 成交额_亿}}"""
+    if not dates:
+        return {}
+    df = _index_daily(code, refresh=refresh).sort_values("date").reset_index(drop=True)
+    # 只保留最早目标日的前一交易日起的窗口，涨跌幅与日期格式化不再遍历全量历史
+    start = int(pd.to_datetime(df["date"]).searchsorted(pd.Timestamp(min(dates))))
+    df = df.iloc[max(start - 1, 0):]
+    df = df.assign(date_str=pd.to_datetime(df["date"]).dt.strftime("%Y%m%d"),
+                   pct=df["close"].pct_change() * 100)
+    pos = pd.Index(df["date_str"]).get_indexer(sorted(set(dates)))
+    has_volume = "volume" in df.columns
+    out = {}
+    for row in df.iloc[pos[pos >= 0]].to_dict(orient="records"):
+        out[row["date_str"]] = {
+            "收盘": round(float(row["close"]), 2),
+            "涨跌幅": round(float(row["pct"]), 2) if pd.notna(row["pct"]) else 0.0,
+            "成交额_亿": round(float(row["volume"]) / 1e8, 0) if has_volume and row["volume"] else 0,
+        }
+    return out
+
+
+def fetch_index_hist(dates: list[str], *, refresh: bool = False) -> dict[str, dict]:
+    """批量获取指数历史数据，返回 {date_str: {name: {close, pct, volume}}}
+
+    refresh=True 时忽略当天已缓存的指数日线。"""
+    per_index: dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=len(INDEX_CODES)) as ex:
+        futs = {ex.submit(_fetch_one_index, code, dates, refresh=refresh): name
+                for code, name in INDEX_CODES}
+        for fut in as_completed(futs):
+            name = futs[fut]
+            try:
+                per_index[name] = fut.result()
+            except Exception as e:
+                print(f"  ⚠ {name} 历史数据获取失败: {e}")
+    # 按固定指数顺序拼装，保证输出中的 key 顺序稳定
+    result: dict[str, dict] = {}
+    for _, name in INDEX_CODES:
+        for d, v in per_index.get(name, {}).items():
+            result.setdefault(d, {})[name] = v
     return result
 
 def fetch_a_spot() -> pd.DataFrame:
     """全A实时行情（新浪源）—— 仅单日模式使用。返回清洗后的 DataFrame。"""
     df = ak.stock_zh_a_spot()
     df["涨跌幅"] = pd.to_numeric(df["涨跌幅"], errors="coerce")
-    df = df[~df["代码"].astype(str).str.startswith("bj")]
-    df = df[~df["名称"].astype(str).str.contains("ST")]
-    df = df[pd.notna(df["涨跌幅"])]
-    df = df[pd.to_numeric(df["成交量"], errors="coerce") > 0]
-    return df
+    # 各过滤条件合成一个布尔掩码，只做一次切片
+    mask = (
+        ~df["代码"].astype(str).str.startswith("bj")
+        & ~df["名称"].astype(str).str.contains("ST", regex=False)
+        & df["涨跌幅"].notna()
+        & (pd.to_numeric(df["成交量"], errors="coerce") > 0)
+    )
+    return df.loc[mask]
 
 def calc_rise_fall_stats(df: pd.DataFrame) -> dict:
     """从全A行情 DataFrame 计算涨跌家数统计。"""
@@ -232,9 +347,39 @@ def calc_rise_fall_stats(df: pd.DataFrame) -> dict:
     flat = int((df["涨跌幅"] == 0).sum())
     return {"上涨": rise, "下跌": fall, "平盘": flat, "涨跌比": round(rise / max(fall, 1), 2), "总数": len(df)}
 
+def disk_cache(endpoint: str):
+    """历史交易日的股池数据不会再变，按 (接口, 日期) 缓存到 CACHE_DIR，重复采集时不再请求网络。
+
+    当日及之后的日期、空结果（获取失败/非交易日）不缓存；refresh=True 时忽略已有缓存重新获取。
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(date_str, *, refresh: bool = False):
+            path = CACHE_DIR / f"{endpoint}_{date_str}.pkl"
+            cacheable = date_str < datetime.now().strftime("%Y%m%d")
+            if cacheable and not refresh and path.exists():
+                try:
+                    return pd.read_pickle(path)
+                except Exception:
+                    pass
+            df = fn(date_str)
+            if cacheable and not df.empty:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                df.to_pickle(tmp)
+                tmp.replace(path)
+            return df
+        return wrapper
+    return deco
+
+
+@disk_cache("zt_pool")
 def fetch_zt_pool(date_str): return _safe_fetch("涨停池", lambda: ak.stock_zt_pool_em(date=date_str))
+@disk_cache("zb_pool")
 def fetch_zb_pool(date_str): return _safe_fetch("炸板池", lambda: ak.stock_zt_pool_zbgc_em(date=date_str))
+@disk_cache("dt_pool")
 def fetch_dt_pool(date_str): return _safe_fetch("跌停池", lambda: ak.stock_zt_pool_dtgc_em(date=date_str))
+@disk_cache("previous_zt")
 def fetch_previous_zt(date_str): return _safe_fetch("昨日涨停池", lambda: ak.stock_zt_pool_previous_em(date=date_str))
 
 
@@ -245,70 +390,87 @@ def fetch_previous_zt(date_str): return _safe_fetch("昨日涨停池", lambda: a
 def analyze_streak_tiers(zt_df):
     if zt_df.empty or "连板数" not in zt_df.columns:
         return []
-    tiers = []
-    for streak, grp in zt_df.groupby("连板数"):
-        tiers.append({"板数": int(streak), "家数": len(grp),
-                       "代表个股": "、".join(grp["名称"].head(3).tolist())})
-    tiers.sort(key=lambda x: x["板数"], reverse=True)
-    return tiers
+    g = zt_df.groupby("连板数")
+    tiers = pd.DataFrame({
+        "家数": g.size(),
+        "代表个股": g.head(3).groupby("连板数")["名称"].agg("、".join),
+    }).sort_index(ascending=False).rename_axis("板数").reset_index()
+    return tiers.astype({"板数": int}).to_dict(orient="records")
 
 def analyze_top_industries(zt_df):
     if zt_df.empty or "所属行业" not in zt_df.columns:
         return []
-    ic = zt_df.groupby("所属行业").agg(
-        涨停家数=("代码", "count"),
-        代表个股=("名称", lambda x: "、".join(x.head(2))),
-    ).sort_values("涨停家数", ascending=False).head(5).reset_index()
+    g = zt_df.groupby("所属行业")
+    ic = pd.DataFrame({
+        "涨停家数": g["代码"].count(),
+        "代表个股": g.head(2).groupby("所属行业")["名称"].agg("、".join),
+    }).sort_values("涨停家数", ascending=False).head(5).reset_index()
     return ic.to_dict(orient="records")
 
 
-def _time_to_seconds(t: str) -> int:
-    """将封板时间字符串(HHMMSS)转换为当日秒数。"""
-    s = str(t).replace(":", "").strip().ljust(6, "0")
-    try:
-        return int(s[:2]) * 3600 + int(s[2:4]) * 60 + int(s[4:6])
-    except (ValueError, IndexError):
-        return 0
+def _times_to_seconds(t: pd.Series) -> np.ndarray:
+    """将封板时间列(HHMMSS)整列转换为当日秒数，无法解析的记为 0。"""
+    s = t.astype(str).str.replace(":", "", regex=False).str.strip().str.ljust(6, "0")
+    hms = [pd.to_numeric(s.str[i:i + 2], errors="coerce") for i in (0, 2, 4)]
+    return (hms[0] * 3600 + hms[1] * 60 + hms[2]).fillna(0).to_numpy()
+
 
+# 板型判定的时间分界（当日秒数）
+AUCTION_CUTOFF = 9 * 3600 + 25 * 60 + 2  # 09:25:02
+OPENING_CUTOFF = 9 * 3600 + 35 * 60      # 09:35:00
+LATE_SESSION = 14 * 3600                 # 14:00:00
 
-def classify_board_type(first_seal, last_seal) -> str:
-    """根据首次/最后封板时间推断板型。
+
+def classify_board_types(df: pd.DataFrame) -> pd.Series:
+    """根据首次/最后封板时间整列推断板型，返回与 df 同索引的 Series。
 
     一字板: 竞价即封全天不开  |  T字板: 竞价封板盘中开板后回封
     秒板: 开盘数分钟内封死    |  换手板: 经充分换手后封板
     烂板: 多次炸开再封        |  尾盘板: 14:00后封板
     """
-    if not first_seal or not last_seal:
-        return "未知"
-    fs = _time_to_seconds(first_seal)
-    ls = _time_to_seconds(last_seal)
-    if fs == 0:
-        return "未知"
+    if "首次封板时间" not in df.columns or "最后封板时间" not in df.columns:
+        return pd.Series("未知", index=df.index)
+    first, last = df["首次封板时间"], df["最后封板时间"]
+    fs = _times_to_seconds(first)
+    ls = _times_to_seconds(last)
     gap = ls - fs
-    auction_cutoff = 9 * 3600 + 25 * 60 + 2  # 09:25:02
+    conds = [
+        ~first.astype(bool).to_numpy() | ~last.astype(bool).to_numpy() | (fs == 0),
+        (fs <= AUCTION_CUTOFF) & (gap <= 2),
+        fs <= AUCTION_CUTOFF,
+        (fs <= OPENING_CUTOFF) & (gap <= 300),
+        fs <= OPENING_CUTOFF,
+        (ls >= LATE_SESSION) & (fs >= LATE_SESSION),
+        ls >= LATE_SESSION,
+        gap <= 600,
+    ]
+    choices = ["未知", "一字板", "T字板", "秒板", "分歧板", "尾盘板", "烂板", "换手板"]
+    return pd.Series(np.select(conds, choices, default="分歧板"), index=df.index)
+
 
-    if fs <= auction_cutoff:
-        return "一字板" if gap <= 2 else "T字板"
-    if fs <= 9 * 3600 + 35 * 60:
-        return "秒板" if gap <= 300 else "分歧板"
-    if ls >= 14 * 3600:
-        return "尾盘板" if fs >= 14 * 3600 else "烂板"
-    return "换手板" if gap <= 600 else "分歧板"
+# 量能对比向前回溯的自然日数（覆盖春节等长假）
+VOLUME_LOOKBACK_DAYS = 30
 
 
 def calc_volume_analysis(current_vol: float, date_str: str) -> dict:
-    """与历史缓存对比，计算量能分析数据。"""
+    """与历史缓存对比，计算量能分析数据。
+
+    从 date_str 前一天起逐日向前查找缓存文件，凑满 5 天即停，不随历史文件增多而全量扫描。"""
     result: dict = {}
     if not DATA_DIR.exists() or current_vol <= 0:
         return result
+    try:
+        base = datetime.strptime(date_str, "%Y%m%d")
+    except ValueError:
+        return result
     recent_vols: list[tuple[str, float]] = []
-    for f in sorted(DATA_DIR.glob("*.json"), reverse=True):
-        d = f.stem
-        if not d.isdigit() or d >= date_str:
+    for k in range(1, VOLUME_LOOKBACK_DAYS + 1):
+        d = (base - timedelta(days=k)).strftime("%Y%m%d")
+        f = DATA_DIR / f"{d}.json"
+        if not f.exists():
             continue
         try:
-            with open(f, "r", encoding="utf-8") as fh:
-                vol = json.load(fh).get("两市成交额_亿", 0)
+            vol = _read_json(f).get("两市成交额_亿", 0)
             if vol > 0:
                 recent_vols.append((d, vol))
         except Exception:
@@ -330,17 +492,17 @@ def enrich_details_with_spot(details: list[dict], spot_df: pd.DataFrame) -> list
     """用全A实时行情数据补充涨停明细的换手率/振幅/量比。"""
     if spot_df.empty or not details:
         return details
-    spot_map: dict[str, dict] = {}
-    for col in ["换手率", "振幅", "量比"]:
+    cols = ["换手率", "振幅", "量比"]
+    for col in cols:
         if col not in spot_df.columns:
             return details
-    for _, row in spot_df.iterrows():
-        code = str(row.get("代码", ""))
-        spot_map[code] = {
-            "换手率": round(float(row.get("换手率", 0)), 2),
-            "振幅": round(float(row.get("振幅", 0)), 2),
-            "量比": round(float(row.get("量比", 0)), 2),
-        }
+    # 只取明细涉及的个股（≤20 只），不为全A数千行逐行建字典
+    wanted = {str(d.get("代码", "")) for d in details}
+    codes = spot_df["代码"].astype(str)
+    hit = codes.isin(wanted)
+    sub = spot_df.loc[hit, cols].apply(pd.to_numeric, errors="coerce").round(2)
+    sub.index = codes[hit]
+    spot_map: dict[str, dict] = sub[~sub.index.duplicated(keep="last")].to_dict(orient="index")
     for d in details:
         code = str(d.get("代码", ""))
         if code in spot_map:
@@ -361,60 +523,64 @@ def get_volume_anomaly_non_zt(spot_df: pd.DataFrame, zt_codes: set[str]) -> list
     missing = [c for c in need_cols if c not in spot_df.columns]
     if missing:
         return []
-    df = spot_df.copy()
-    df["量比"] = pd.to_numeric(df["量比"], errors="coerce").fillna(0)
-    df["涨跌幅"] = pd.to_numeric(df["涨跌幅"], errors="coerce").fillna(0)
-    # 排除涨停：涨跌幅 < 9.5 或 代码不在涨停池
-    df = df[df["涨跌幅"] < 9.5]
-    df = df[~df["代码"].astype(str).isin(zt_codes)]
-    df = df[df["量比"] >= VOLUME_ANOMALY_LIANGBI_MIN]
-    df = df.sort_values("量比", ascending=False).head(VOLUME_ANOMALY_TOP_N)
-    out = []
-    for _, row in df.iterrows():
-        try:
-            vol = row.get("成交额", 0)
-            if hasattr(vol, "item"):
-                vol = vol.item()
-            vol = round(float(vol), 0) if vol else 0
-        except (TypeError, ValueError):
-            vol = 0
-        out.append({
-            "代码": str(row["代码"]),
-            "名称": str(row["名称"]),
-            "涨跌幅": round(float(row["涨跌幅"]), 2),
-            "量比": round(float(row["量比"]), 2),
-            "换手率": round(float(row.get("换手率", 0)), 2),
-            "成交额": vol,
-        })
-    return out
+    liangbi = pd.to_numeric(spot_df["量比"], errors="coerce").fillna(0)
+    pct = pd.to_numeric(spot_df["涨跌幅"], errors="coerce").fillna(0)
+    # 排除涨停：涨跌幅 < 9.5 且 代码不在涨停池
+    mask = (pct < 9.5) & (liangbi >= VOLUME_ANOMALY_LIANGBI_MIN) & ~spot_df["代码"].astype(str).isin(zt_codes)
+    df = spot_df.loc[mask, need_cols].assign(量比=liangbi[mask], 涨跌幅=pct[mask])
+    df = df.nlargest(VOLUME_ANOMALY_TOP_N, "量比")
+    vol = pd.to_numeric(df["成交额"], errors="coerce").round(0)
+    df = df.assign(
+        代码=df["代码"].astype(str),
+        名称=df["名称"].astype(str),
+        换手率=pd.to_numeric(df["换手率"], errors="coerce"),
+        成交额=vol.astype(object).where(vol != 0, 0),
+    ).round({"涨跌幅": 2, "量比": 2, "换手率": 2})
+    return df.to_dict(orient="records")
 
 
 # ---------------------------------------------------------------------------
 # 单日采集
 # ---------------------------------------------------------------------------
 
-def collect_single(date_str: str, *, use_realtime: bool = True, index_hist: Optional[dict] = None) -> dict:
-    """采集单日数据。use_realtime=True 时使用实时接口（适合当日），否则用历史接口。"""
+def collect_single(date_str: str, *, use_realtime: bool = True, index_hist: Optional[dict] = None,
+                   volume_analysis: bool = True, refresh: bool = False) -> dict:
+    """采集单日数据。use_realtime=True 时使用实时接口（适合当日），否则用历史接口。
+
+    volume_analysis=False 时不计算「量能分析」（依赖前几日已保存的数据，由批量采集按日期顺序补算）。
+    refresh=True 时忽略股池接口的磁盘缓存。"""
+    # 各接口互不依赖且均为网络 I/O，并发请求，耗时约为最慢的单个请求
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        futs = {
+            "zt": ex.submit(fetch_zt_pool, date_str, refresh=refresh),
+            "zb": ex.submit(fetch_zb_pool, date_str, refresh=refresh),
+            "dt": ex.submit(fetch_dt_pool, date_str, refresh=refresh),
+            "prev": ex.submit(fetch_previous_zt, date_str, refresh=refresh),
+        }
+        if use_realtime:
+            futs["idx"] = ex.submit(fetch_index_data)
+            futs["spot"] = ex.submit(_safe_fetch, "全A行情", fetch_a_spot)
+
     spot_df = pd.DataFrame()
     if use_realtime:
-        index_data = fetch_index_data()
-        spot_df = _safe_fetch("全A行情", fetch_a_spot)
+        index_data = futs["idx"].result()
+        spot_df = futs["spot"].result()
         rf = calc_rise_fall_stats(spot_df) if not spot_df.empty else {
             "上涨": 0, "下跌": 0, "平盘": 0, "涨跌比": 1.0, "总数": 0}
     else:
         index_data = (index_hist or {}).get(date_str, {})
         rf = {"上涨": 0, "下跌": 0, "平盘": 0, "涨跌比": 1.0, "总数": 0}
 
-    zt_df = fetch_zt_pool(date_str)
+    zt_df = futs["zt"].result()
     zt_count = len(zt_df)
-    zb_df = fetch_zb_pool(date_str)
+    zb_df = futs["zb"].result()
     zb_count = len(zb_df)
     seal_rate = round(zt_count / max(zt_count + zb_count, 1) * 100, 1)
 
-    dt_df = fetch_dt_pool(date_str)
+    dt_df = futs["dt"].result()
     dt_count = len(dt_df)
 
-    prev_df = fetch_previous_zt(date_str)
+    prev_df = futs["prev"].result()
     if not prev_df.empty and "涨跌幅" in prev_df.columns:
         premium = round(prev_df["涨跌幅"].astype(float).mean(), 2)
     else:
@@ -445,16 +611,11 @@ def collect_single(date_str: str, *, use_realtime: bool = True, index_hist: Opti
     if not zt_df.empty:
         cols = ["代码", "名称", "涨跌幅", "连板数", "首次封板时间", "最后封板时间", "封板资金", "所属行业"]
         available = [c for c in cols if c in zt_df.columns]
-        for _, row in zt_df[available].head(20).iterrows():
-            d = row.to_dict()
-            d["板型"] = classify_board_type(d.get("首次封板时间"), d.get("最后封板时间"))
-            zt_details.append(d)
+        top_df = zt_df[available].head(20)
+        zt_details = top_df.assign(板型=classify_board_types(top_df)).to_dict(orient="records")
         if "连板数" in zt_df.columns:
-            lb_df = zt_df[zt_df["连板数"] >= 2].sort_values("连板数", ascending=False)
-            for _, row in lb_df[available].iterrows():
-                d = row.to_dict()
-                d["板型"] = classify_board_type(d.get("首次封板时间"), d.get("最后封板时间"))
-                lianban_details.append(d)
+            lb_df = zt_df[zt_df["连板数"] >= 2].sort_values("连板数", ascending=False)[available]
+            lianban_details = lb_df.assign(板型=classify_board_types(lb_df)).to_dict(orient="records")
 
     # 用全A行情补充连板股的换手率/振幅/量比（仅实时模式）
     if use_realtime and not spot_df.empty:
@@ -466,9 +627,9 @@ def collect_single(date_str: str, *, use_realtime: bool = True, index_hist: Opti
     volume_anomaly = get_volume_anomaly_non_zt(spot_df, zt_codes) if use_realtime and not spot_df.empty else []
 
     # 量能分析
-    vol_analysis = calc_volume_analysis(total_vol, date_str) if total_vol > 0 else {}
+    vol_analysis = calc_volume_analysis(total_vol, date_str) if volume_analysis and total_vol > 0 else {}
 
-    return {
+    return _nan_to_none({
         "日期": date_str, "指数": index_data, "两市成交额_亿": total_vol,
         "量能分析": vol_analysis, "涨跌统计": rf,
         "涨停家数": zt_count, "炸板家数": zb_count,
@@ -478,7 +639,7 @@ def collect_single(date_str: str, *, use_realtime: bool = True, index_hist: Opti
         "量能异动_未涨停": volume_anomaly,
         "情绪各维度": dim_scores,
         "情绪综合得分": total_score, "情绪阶段": emotion_stage_full(total_score),
-    }
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -487,7 +648,6 @@ def collect_single(date_str: str, *, use_realtime: bool = True, index_hist: Opti
 
 def collect_batch(dates: list[str], *, force: bool = False) -> list[dict]:
     """批量采集多个交易日数据，支持增量更新。"""
-    DATA_DIR.mkdir(exist_ok=True)
     today_str = datetime.now().strftime("%Y%m%d")
 
     to_collect = []
@@ -506,6 +666,8 @@ def collect_batch(dates: list[str], *, force: bool = False) -> list[dict]:
         return _load_cached(dates)
 
     print(f"📊 需采集 {len(to_collect)} 个交易日\n")
+    # 整批只建一次目录，逐日保存时不再 mkdir
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     hist_dates = [d for d in to_collect if d != today_str]
     is_today_in_list = today_str in to_collect
@@ -513,23 +675,49 @@ def collect_batch(dates: list[str], *, force: bool = False) -> list[dict]:
     index_hist = {}
     if hist_dates:
         print("  获取指数历史数据...")
-        index_hist = fetch_index_hist(hist_dates)
-
+        index_hist = fetch_index_hist(hist_dates, refresh=force)
+
+    # 各日互不依赖，按有限并发采集；请求速率由 _safe_fetch 中的限流器统一控制（仅此处启用）。
+    # 量能分析要对比前几日已保存的成交额，因此采集完成后按日期顺序落盘：排在前面的日期都已落盘
+    # （或失败/无数据）时才补算该日量能分析并保存，批量中断时已落盘的文件都是完整的
+    order = sorted(to_collect)
+    pending: dict[str, dict | None] = {}
+    next_i = 0
     results = []
+    header_entries: dict[str, dict] = {}
     total = len(to_collect)
-    for i, d in enumerate(to_collect, 1):
-        print(f"  [{i}/{total}] 采集 {d}...", end=" ", flush=True)
-        use_rt = (d == today_str)
-        try:
-            data = collect_single(d, use_realtime=use_rt, index_hist=index_hist)
-            if data["涨停家数"] == 0 and data["跌停家数"] == 0:
-                print("⏭ 无数据（非交易日？）")
-                continue
-            _save_json(data, d)
-            print("✅")
-            results.append(data)
-        except Exception as e:
-            print(f"❌ {e}")
+    _throttle.set()
+    try:
+        with ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as ex:
+            futs = {
+                ex.submit(collect_single, d, use_realtime=(d == today_str), index_hist=index_hist,
+                          volume_analysis=False, refresh=force): d
+                for d in order
+            }
+            for i, fut in enumerate(as_completed(futs), 1):
+                d = futs[fut]
+                data = None
+                try:
+                    data = fut.result()
+                except Exception as e:
+                    print(f"  [{i}/{total}] 采集 {d} ❌ {e}")
+                else:
+                    if data["涨停家数"] == 0 and data["跌停家数"] == 0:
+                        print(f"  [{i}/{total}] 采集 {d} ⏭ 无数据（非交易日？）")
+                        data = None
+                    else:
+                        print(f"  [{i}/{total}] 采集 {d} ✅")
+                pending[d] = data
+                while next_i < len(order) and order[next_i] in pending:
+                    ready = pending.pop(order[next_i])
+                    next_i += 1
+                    if ready is not None and _save_with_volume(ready, header_entries):
+                        results.append(ready)
+    finally:
+        _throttle.clear()
+        # 汇总索引在整批结束（含中断）时按月一次写回，不随每日保存反复读写
+        if header_entries:
+            _update_summary_headers(header_entries)
 
     for d in cached:
         loaded = _load_single(d)
@@ -540,6 +728,19 @@ def collect_batch(dates: list[str], *, force: bool = False) -> list[dict]:
     return results
 
 
+def _save_with_volume(data: dict, header_entries: dict) -> bool:
+    """补算量能分析后保存当日 JSON（索引条目收集到 header_entries）；保存失败时打印原因并返回 False。"""
+    d = data["日期"]
+    total_vol = data["两市成交额_亿"]
+    data["量能分析"] = calc_volume_analysis(total_vol, d) if total_vol > 0 else {}
+    try:
+        _save_json(data, d, header_entries)
+    except Exception as e:
+        print(f"  保存 {d} ❌ {e}")
+        return False
+    return True
+
+
 def _load_cached(dates: list[str]) -> list[dict]:
     results = []
     for d in dates:
@@ -550,11 +751,75 @@ def _load_cached(dates: list[str]) -> list[dict]:
     return results
 
 
+def _read_json(path: Path):
+    """读取 JSON 文件；装了 orjson 时走其 C 实现，含 NaN 等非标准字面量时回退标准库。"""
+    if _HAS_ORJSON:
+        try:
+            return orjson.loads(path.read_bytes())
+        except orjson.JSONDecodeError:
+            pass
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 需要转换的类型按 type 直接查表，省去逐个 isinstance 判断
+_JSON_CONVERTERS = {
+    pd.DataFrame: lambda obj: obj.to_dict(orient="records"),
+    pd.Timestamp: str,
+    datetime: str,
+}
+
+
+def _json_default(obj):
+    """把 DataFrame、时间戳与 numpy 标量转成 JSON 基本类型，供 json / orjson 序列化时回调。"""
+    conv = _JSON_CONVERTERS.get(type(obj))
+    if conv is not None:
+        return conv(obj)
+    # numpy 标量类型众多，不逐一登记，统一按 .item() 转为 Python 标量
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class _DataEncoder(json.JSONEncoder):
+    def default(self, obj):
+        return _json_default(obj)
+
+
+def _nan_to_none(obj):
+    """递归把 NaN/inf 换成 None。orjson 会把 NaN 写成 null、标准库写成 NaN，采集结果先统一，
+    两种编码写出的文件与内存中的数据才一致。"""
+    if isinstance(obj, (float, np.floating)):
+        return obj if np.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _nan_to_none(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_nan_to_none(v) for v in obj]
+    return obj
+
+
+def _or_nan(v):
+    """格式化数值前调用：缺失值（None / JSON null）按 NaN 输出，旧文件中的 NaN 与新文件的 null 显示一致。"""
+    return float("nan") if v is None else v
+
+
+def _write_json(path: Path, obj, *, indent: bool = True):
+    """一次序列化直接写盘；装了 orjson 时由其 C 实现编码（NaN 写为 null），否则用标准库。"""
+    if _HAS_ORJSON:
+        # 时间戳交给 _json_default 转 str，与标准库路径的写法一致
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        path.write_bytes(orjson.dumps(obj, default=_json_default, option=option))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, cls=_DataEncoder, ensure_ascii=False, indent=2 if indent else None)
+
+
 def _load_single(date_str: str) -> dict | None:
     path = DATA_DIR / f"{date_str}.json"
     if path.exists():
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _read_json(path)
     return None
 
 
@@ -562,8 +827,14 @@ def _load_single(date_str: str) -> dict | None:
 # 周期汇总报告
 # ---------------------------------------------------------------------------
 
+# _compat 迁移规则的版本；已按当前规则迁移过的记录带此标记，再次调用时直接返回
+COMPAT_VERSION = 1
+
+
 def _compat(r: dict) -> dict:
     """兼容新旧 JSON 格式的 key 差异。"""
+    if r.get("_compat_v") == COMPAT_VERSION:
+        return r
     if "情绪综合得分" not in r and "情绪得分" in r:
         r["情绪综合得分"] = r["情绪得分"]
     if "情绪各维度" not in r and "维度" in r:
@@ -604,16 +875,99 @@ def _compat(r: dict) -> dict:
         r["连板梯队"] = new_tiers
     elif not isinstance(tiers, list):
         r["连板梯队"] = []
+    r["_compat_v"] = COMPAT_VERSION
     return r
 
 
-def generate_summary(dates: list[str], data_dir: Path) -> str:
-    """生成周期汇总报告（Markdown 格式），同时打印到控制台并保存文件。"""
+# 周期汇总用到的字段；每日 JSON 保存时另抄一份（已经 _compat 迁移）到当月的汇总索引，汇总时不必再解析整份明细
+SUMMARY_KEYS = ("日期", "指数", "涨停家数", "炸板家数", "封板率", "跌停家数", "昨涨停溢价率",
+                "最高连板", "情绪综合得分", "情绪得分", "连板梯队", "涨停行业TOP5", "_compat_v")
+
+
+def _summary_header_path(month: str) -> Path:
+    return CACHE_DIR / f"summary_header_{month}.json"
+
+
+def _load_summary_header(month: str) -> dict:
+    path = _summary_header_path(month)
+    if not path.exists():
+        return {}
+    try:
+        return _read_json(path)
+    except Exception:
+        return {}
+
+
+def _save_summary_header(month: str, header: dict):
+    path = _summary_header_path(month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    _write_json(tmp, header, indent=False)
+    tmp.replace(path)
+
+
+def _summary_header_entry(data: dict, path: Path) -> dict:
+    """汇总索引中的一条：记下源 JSON 的 mtime/大小，源文件被改动后自动失效。"""
+    st = path.stat()
+    data = _compat(dict(data))
+    entry = {k: data[k] for k in SUMMARY_KEYS if k in data}
+    entry["_stat"] = [st.st_mtime_ns, st.st_size]
+    return entry
+
+
+def _update_summary_headers(entries: dict):
+    """把若干日的索引条目按月合并写回，每个涉及的月份只读写一次。"""
+    by_month: dict[str, dict] = {}
+    for d, entry in entries.items():
+        by_month.setdefault(d[:6], {})[d] = entry
+    for month, month_entries in by_month.items():
+        header = _load_summary_header(month)
+        header.update(month_entries)
+        _save_summary_header(month, header)
+
+
+def _load_summary_records(dates: list[str]) -> list[dict]:
+    """按日期读取汇总所需字段：汇总索引命中则直接取用，否则解析整份 JSON 并回填索引。
+
+    索引按月分文件，只读取所汇总日期涉及的月份。"""
+    headers: dict[str, dict] = {}
+    dirty: dict[str, dict] = {}
     records = []
     for d in dates:
-        data = _load_single(d)
+        path = DATA_DIR / f"{d}.json"
+        if not path.exists():
+            continue
+        st = path.stat()
+        month = d[:6]
+        if month not in headers:
+            headers[month] = _load_summary_header(month)
+        entry = headers[month].get(d)
+        if entry and entry.get("_stat") == [st.st_mtime_ns, st.st_size]:
+            data = {k: v for k, v in entry.items() if k != "_stat"}
+        else:
+            data = _read_json(path)
+            if data:
+                dirty[d] = headers[month][d] = _summary_header_entry(data, path)
         if data:
             records.append(_compat(data))
+    if dirty:
+        _update_summary_headers(dirty)
+    return records
+
+
+# 每日情绪核心数据表的行模板（字段取自当日记录，阶段另行传入）
+_SUMMARY_DAY_ROW = ("| {日期} | {涨停家数} | {炸板家数} | {封板率}% | {跌停家数} | {昨涨停溢价率:+.2f}% "
+                    "| {最高连板}板 | {情绪综合得分:.2f} | {阶段} |")
+
+
+def _index_cell(v: dict) -> str:
+    c = _or_nan(v.get("收盘", "--"))
+    return f"{c}（{_or_nan(v.get('涨跌幅', 0)):+.2f}%）" if c != "--" else "--"
+
+
+def generate_summary(dates: list[str], data_dir: Path) -> str:
+    """生成周期汇总报告（Markdown 格式），同时打印到控制台并保存文件。"""
+    records = _load_summary_records(dates)
     if not records:
         return "无可用数据"
 
@@ -626,117 +980,93 @@ def generate_summary(dates: list[str], data_dir: Path) -> str:
     lines.append("")
 
     # 区间统计
-    zt_counts = [r["涨停家数"] for r in records]
-    scores = [r["情绪综合得分"] for r in records]
-    avg_zt = sum(zt_counts) / len(zt_counts)
-    avg_score = sum(scores) / len(scores)
-    max_s = max(scores)
-    min_s = min(scores)
-    max_d = next(r["日期"] for r in records if r["情绪综合得分"] == max_s)
-    min_d = next(r["日期"] for r in records if r["情绪综合得分"] == min_s)
+    stats = pd.DataFrame(records, columns=["日期", "涨停家数", "情绪综合得分"]).set_index("日期")
+    scores = stats["情绪综合得分"]
+    avg_zt = stats["涨停家数"].mean()
+    avg_score = scores.mean()
+    max_s, min_s = scores.max(), scores.min()
+    max_d, min_d = scores.idxmax(), scores.idxmin()
 
     idx_first = records[0].get("指数", {}).get("上证指数", {})
     idx_last = records[-1].get("指数", {}).get("上证指数", {})
-    first_close = idx_first.get("收盘", 0)
-    last_close = idx_last.get("收盘", 0)
+    first_close = _or_nan(idx_first.get("收盘", 0))
+    last_close = _or_nan(idx_last.get("收盘", 0))
     period_ret = round((last_close / first_close - 1) * 100, 2) if first_close else 0
 
-    lines.append("## 区间统计")
-    lines.append("")
-    lines.append(f"| 指标 | 数值 |")
-    lines.append(f"|------|------|")
-    lines.append(f"| 交易天数 | {len(records)} 天 |")
-    lines.append(f"| 日均涨停 | {avg_zt:.1f} 家 |")
-    lines.append(f"| 平均情绪得分 | {avg_score:.2f} 分 |")
-    lines.append(f"| 最高情绪 | {max_s:.2f}（{max_d}） |")
-    lines.append(f"| 最低情绪 | {min_s:.2f}（{min_d}） |")
-    lines.append(f"| 上证区间涨幅 | {period_ret:+.2f}%（{first_close} → {last_close}） |")
-    lines.append("")
+    lines += [
+        "## 区间统计",
+        "",
+        "| 指标 | 数值 |",
+        "|------|------|",
+        f"| 交易天数 | {len(records)} 天 |",
+        f"| 日均涨停 | {avg_zt:.1f} 家 |",
+        f"| 平均情绪得分 | {avg_score:.2f} 分 |",
+        f"| 最高情绪 | {max_s:.2f}（{max_d}） |",
+        f"| 最低情绪 | {min_s:.2f}（{min_d}） |",
+        f"| 上证区间涨幅 | {period_ret:+.2f}%（{first_close} → {last_close}） |",
+        "",
+    ]
 
     # 指数走势表
-    lines.append("## 三大指数走势")
-    lines.append("")
-    lines.append("| 日期 | 上证指数 | 深证成指 | 创业板指 |")
-    lines.append("|------|----------|----------|----------|")
-    for r in records:
-        d = r["日期"]
-        idx = r.get("指数", {})
-        cells = []
-        for name in ["上证指数", "深证成指", "创业板指"]:
-            v = idx.get(name, {})
-            c = v.get("收盘", "--")
-            p = v.get("涨跌幅", 0)
-            cells.append(f"{c}（{p:+.2f}%）" if c != "--" else "--")
-        lines.append(f"| {d} | {cells[0]} | {cells[1]} | {cells[2]} |")
+    lines += ["## 三大指数走势", "", "| 日期 | 上证指数 | 深证成指 | 创业板指 |",
+              "|------|----------|----------|----------|"]
+    lines.extend(
+        "| {} | {} | {} | {} |".format(r["日期"], *(_index_cell(r.get("指数", {}).get(name, {}))
+                                                  for name in ("上证指数", "深证成指", "创业板指")))
+        for r in records)
     lines.append("")
 
     # 情绪核心数据表
-    lines.append("## 每日情绪核心数据")
-    lines.append("")
-    lines.append("| 日期 | 涨停 | 炸板 | 封板率 | 跌停 | 溢价率 | 最高连板 | 得分 | 阶段 |")
-    lines.append("|------|------|------|--------|------|--------|---------|------|------|")
-    for r in records:
-        stage = emotion_stage(r["情绪综合得分"])
-        lines.append(
-            f"| {r['日期']} | {r['涨停家数']} | {r['炸板家数']} | {r['封板率']}% "
-            f"| {r['跌停家数']} | {r['昨涨停溢价率']:+.2f}% | {r['最高连板']}板 "
-            f"| {r['情绪综合得分']:.2f} | {stage} |"
-        )
+    lines += ["## 每日情绪核心数据", "", "| 日期 | 涨停 | 炸板 | 封板率 | 跌停 | 溢价率 | 最高连板 | 得分 | 阶段 |",
+              "|------|------|------|--------|------|--------|---------|------|------|"]
+    stages = emotion_stages(scores.to_numpy())
+    lines.extend(_SUMMARY_DAY_ROW.format_map({**r, "昨涨停溢价率": _or_nan(r.get("昨涨停溢价率")),
+                                              "情绪综合得分": _or_nan(r.get("情绪综合得分")), "阶段": stage})
+                 for r, stage in zip(records, stages))
     lines.append("")
 
     # 情绪走势曲线
-    lines.append("## 情绪走势曲线")
-    lines.append("")
-    lines.append("```")
-    for r in records:
+    lines += ["## 情绪走势曲线", "", "```"]
+    for r, stage in zip(records, stages):
         s = r["情绪综合得分"]
         bar_len = int(s / 10 * 40)
-        bar = "█" * bar_len + "░" * (40 - bar_len)
-        stage = emotion_stage(s)
-        lines.append(f"  {r['日期']} {bar} {s:.2f} {stage}")
-    lines.append("```")
-    lines.append("")
+        lines.append(f"  {r['日期']} {'█' * bar_len}{'░' * (40 - bar_len)} {s:.2f} {stage}")
+    lines += ["```", ""]
 
     # 龙头演进追踪
     lines.append("## 龙头演进追踪")
     lines.append("")
-    stock_history = defaultdict(list)
-    for r in records:
-        for tier in r.get("连板梯队", []):
-            if tier["板数"] >= 2:
-                for name in tier["代表个股"].split("、"):
-                    name = name.strip()
-                    if name:
-                        stock_history[name].append((r["日期"], tier["板数"]))
-
-    leaders = {name: hist for name, hist in stock_history.items() if len(hist) >= 2}
-    if leaders:
-        leaders_sorted = sorted(leaders.items(), key=lambda x: max(b for _, b in x[1]), reverse=True)
-        lines.append("| 龙头 | 演进轨迹 | 最高板数 |")
-        lines.append("|------|----------|---------|")
-        for name, hist in leaders_sorted[:10]:
-            trail = " → ".join(f"{d[4:6]}/{d[6:]}({b}板)" for d, b in hist)
-            max_b = max(b for _, b in hist)
-            lines.append(f"| {name} | {trail} | {max_b}板 |")
+    lead = pd.DataFrame(
+        [(r["日期"], t["板数"], t["代表个股"]) for r in records
+         for t in r.get("连板梯队", []) if t["板数"] >= 2],
+        columns=["日期", "板数", "名称"])
+    lead = lead.assign(名称=lead["名称"].str.split("、")).explode("名称")
+    lead["名称"] = lead["名称"].str.strip()
+    lead = lead[lead["名称"].fillna("") != ""]
+    lead["轨迹"] = (lead["日期"].str[4:6] + "/" + lead["日期"].str[6:]
+                  + "(" + lead["板数"].astype(str) + "板)")
+    # sort=False 保留个股首次出现的顺序，稳定排序后同板数者的先后与出现顺序一致
+    g = lead.groupby("名称", sort=False)
+    leaders = pd.DataFrame({
+        "次数": g.size(), "轨迹": g["轨迹"].agg(" → ".join), "最高板数": g["板数"].max(),
+    })
+    leaders = leaders[leaders["次数"] >= 2].sort_values("最高板数", ascending=False, kind="stable")
+    if not leaders.empty:
+        lines += ["| 龙头 | 演进轨迹 | 最高板数 |", "|------|----------|---------|"]
+        top = leaders.head(10)
+        lines.extend(f"| {name} | {trail} | {max_b}板 |"
+                     for name, trail, max_b in zip(top.index, top["轨迹"], top["最高板数"]))
     else:
         lines.append("_本周期内无跨日连板龙头_")
     lines.append("")
 
     # 题材轮动汇总
-    lines.append("## 题材轮动")
-    lines.append("")
-    lines.append("| 日期 | TOP1 行业 | TOP2 行业 | TOP3 行业 |")
-    lines.append("|------|-----------|-----------|-----------|")
+    lines += ["## 题材轮动", "", "| 日期 | TOP1 行业 | TOP2 行业 | TOP3 行业 |",
+              "|------|-----------|-----------|-----------|"]
     for r in records:
-        tops = r.get("涨停行业TOP5", [])
-        cells = []
-        for i in range(3):
-            if i < len(tops):
-                t = tops[i]
-                cells.append(f"{t['所属行业']}({t['涨停家数']})")
-            else:
-                cells.append("--")
-        lines.append(f"| {r['日期']} | {cells[0]} | {cells[1]} | {cells[2]} |")
+        cells = [f"{t['所属行业']}({t['涨停家数']})" for t in r.get("涨停行业TOP5", [])[:3]]
+        cells += ["--"] * (3 - len(cells))
+        lines.append("| {} | {} | {} | {} |".format(r["日期"], *cells))
     lines.append("")
 
     md = "\n".join(lines)
@@ -764,6 +1094,133 @@ REVIEW_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "复盘模板"
 DAILY_REVIEW_DIR = Path(__file__).resolve().parent.parent / "每日复盘"
 WEEKDAY_CN = ["一", "二", "三", "四", "五", "六", "日"]
 
+# 复盘草稿的固定段落，导入时拼好；带 {占位} 的在生成时整块 format，不再逐行拼接
+_DRAFT_OVERVIEW = """# 每日情绪复盘 - {year}/{month}/{day}（星期{week}）
+
+---
+
+## 一、大盘概览
+
+| 指标 | 数值 | 备注 |
+|------|------|------|
+| 上证指数 | {sh} | 5日线上方 / 下方 |
+| 深成指 | {sz} | 5日线上方 / 下方 |
+| 创业板指 | {cyb} | 5日线上方 / 下方 |
+| 两市成交额 | {amount} 亿 | {vol_note} |
+| 5日均量 | {avg5} 亿 | 今日成交额 vs 5日均量：{vol_5} |
+| 上涨家数 | {up} 家 | |
+| 下跌家数 | {down} 家 | |
+| 涨跌比 | {ratio} | >2 普涨 / 1-2 偏强 / 0.5-1 偏弱 / <0.5 普跌 |
+
+**大盘技术位置**：
+- 上证：__日均线附近（支撑/压力位 ____ 点）
+- 创业板：__日均线附近（支撑/压力位 ____ 点）
+- 大盘周期判断：上升趋势 / 震荡 / 下降趋势
+
+---
+
+## 二、竞价复盘
+
+（请根据盘面补充：核心股竞价表现、竞价整体氛围）
+
+---
+
+## 三、情绪核心数据
+"""
+
+_DRAFT_CORE = """| 指标 | 原始值 | 评分(1-10) | 评分参考 |
+|------|--------|-----------|----------|
+| 涨停家数 | {zt} 家 | {s_zt} | <20→1-2 / 20-40→3-4 / ... |
+| 封板率 | {seal}% | {s_seal} | <40%→1-3 / ... |
+| 昨涨停今日溢价率 | {premium}% | {s_premium} | <-5%→1 / ... |
+| 最高连板 | {streak} 板 | {s_streak} | 无→1 / 2板→3 / ... |
+| 涨跌比 | {ratio} | {s_ratio} | <0.3→1 / ... |
+| 跌停家数 | {dt} 家 | {s_dt} | >30→1 / ... |
+
+### 亏钱效应追踪
+
+| 指标 | 数值 | 说明 |
+|------|------|------|
+| 大面股数量 | ____ 家 | 昨日涨停/连板今日跌幅 > 5% 的个股 |
+| 昨涨停大面比例 | ____% | 大面股 / 昨日涨停总数 |
+| 炸板股数量 | {zb} 家 | 盘中触及涨停但未封住 |
+
+### 情绪综合得分
+
+**今日情绪得分：{today} 分**
+
+### 连板梯队分布
+
+| 板数 | 家数 | 代表个股 |
+|------|------|----------|"""
+
+_DRAFT_CYCLE = """
+---
+
+## 四、情绪周期定位
+
+### 得分走势
+
+- **前日情绪得分**：{prev2} 分
+- **昨日情绪得分**：{prev1} 分
+- **今日情绪得分**：{today} 分
+- **3日趋势**：{trend}
+
+### 当前所处周期阶段
+
+- 当前阶段：{stage}
+
+---
+
+## 五、龙头梳理
+
+（请根据盘面补充：总龙头、补涨龙、前排助攻、龙头演进判断）
+
+---
+
+## 六、题材板块分析
+
+### 当日最强题材 TOP3
+
+| 排名 | 题材名称 | 涨停家数 | 代表个股 |
+|------|----------|----------|----------|"""
+
+_DRAFT_ANOMALY_HEAD = """
+### 量能异动（未涨停）
+
+| 名称 | 涨跌幅 | 量比 | 换手率 |
+|------|--------|------|--------|"""
+
+_DRAFT_TAIL = """
+---
+
+## 七、五日线低吸跟踪
+
+（请根据盘面补充：低吸候选池）
+
+---
+
+## 八、持仓管理
+
+（请补充：当前持仓、明日操作计划）
+
+---
+
+## 九、明日策略
+
+（请根据复盘结论补充：情景预案、竞价策略、仓位计划、关注方向、风险提示）
+
+---
+
+## 十、交易纪律自检
+
+（请补充：今日操作回顾、纪律检查）
+
+---
+
+> **本稿由脚本自动生成，请在此基础上补充主观判断与操作计划。**
+"""
+
 
 def _get_prev_trading_days(date_str: str, n: int) -> list[str]:
     """返回 date_str 及之前共 n 个交易日的列表（含 date_str），按时间正序。"""
@@ -776,6 +1233,13 @@ def _get_prev_trading_days(date_str: str, n: int) -> list[str]:
     return all_days[-n:] if len(all_days) >= n else all_days
 
 
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: Path) -> Path:
+    """同一进程内每个目录只建一次，批量生成草稿时不再逐日 mkdir。"""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def generate_draft_review(
     date_str: str,
     data_dict: dict,
@@ -791,8 +1255,7 @@ def generate_draft_review(
         week_cn = WEEKDAY_CN[wd]
     except ValueError:
         week_cn = "X"
-    out_path = out_dir / yyyymm / f"{day_slug}_draft.md"
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path = _ensure_dir(out_dir / yyyymm) / f"{day_slug}_draft.md"
 
     # 前两日数据（用于 3 日趋势）
     prev3 = _get_prev_trading_days(date_str, 3)
@@ -823,16 +1286,20 @@ def generate_draft_review(
         trend_3d = "____（不足3日数据）"
     score_prev2 = scores_3d[0] if len(scores_3d) >= 3 else "____"
     score_prev1 = scores_3d[1] if len(scores_3d) >= 2 else "____"
-    score_today = data_dict.get("情绪综合得分", "____")
+    score_today = _or_nan(data_dict.get("情绪综合得分", "____"))
 
     idx = data_dict.get("指数", {})
     vol = data_dict.get("量能分析", {})
     rf = data_dict.get("涨跌统计", {})
+    ratio = rf.get("涨跌比", "____")
+    dim = data_dict.get("情绪各维度", {})
+    tiers = data_dict.get("连板梯队") or []
+    top3 = (data_dict.get("涨停行业TOP5") or [])[:3]
 
     def idx_cell(name: str) -> str:
         v = idx.get(name, {})
-        c = v.get("收盘", "____")
-        p = v.get("涨跌幅", 0)
+        c = _or_nan(v.get("收盘", "____"))
+        p = _or_nan(v.get("涨跌幅", 0))
         if c == "____":
             return "____ 点（____%）"
         return f"{c} 点（{p:+.2f}%）"
@@ -844,164 +1311,59 @@ def generate_draft_review(
     if vol.get("vs_5日均量%") is not None:
         vol_5 = "放量" if vol["vs_5日均量%"] > 5 else ("缩量" if vol["vs_5日均量%"] < -5 else "持平")
 
+    get = data_dict.get
     lines = [
-        f"# 每日情绪复盘 - {day_slug[:4]}/{day_slug[5:7]}/{day_slug[8:10]}（星期{week_cn}）",
-        "",
-        "---",
-        "",
-        "## 一、大盘概览",
-        "",
-        "| 指标 | 数值 | 备注 |",
-        "|------|------|------|",
-        f"| 上证指数 | {idx_cell('上证指数')} | 5日线上方 / 下方 |",
-        f"| 深成指 | {idx_cell('深证成指')} | 5日线上方 / 下方 |",
-        f"| 创业板指 | {idx_cell('创业板指')} | 5日线上方 / 下方 |",
-        f"| 两市成交额 | {data_dict.get('两市成交额_亿', '____')} 亿 | {vol_note} |",
-        f"| 5日均量 | {vol.get('5日均量_亿', '____')} 亿 | 今日成交额 vs 5日均量：{vol_5} |",
-        f"| 上涨家数 | {rf.get('上涨', '____')} 家 | |",
-        f"| 下跌家数 | {rf.get('下跌', '____')} 家 | |",
-        f"| 涨跌比 | {rf.get('涨跌比', '____')} | >2 普涨 / 1-2 偏强 / 0.5-1 偏弱 / <0.5 普跌 |",
-        "",
-        "**大盘技术位置**：",
-        "- 上证：__日均线附近（支撑/压力位 ____ 点）",
-        "- 创业板：__日均线附近（支撑/压力位 ____ 点）",
-        "- 大盘周期判断：上升趋势 / 震荡 / 下降趋势",
-        "",
-        "---",
-        "",
-        "## 二、竞价复盘",
-        "",
-        "（请根据盘面补充：核心股竞价表现、竞价整体氛围）",
-        "",
-        "---",
-        "",
-        "## 三、情绪核心数据",
-        "",
+        _DRAFT_OVERVIEW.format(
+            year=day_slug[:4], month=day_slug[5:7], day=day_slug[8:10], week=week_cn,
+            sh=idx_cell("上证指数"), sz=idx_cell("深证成指"), cyb=idx_cell("创业板指"),
+            amount=_or_nan(get("两市成交额_亿", "____")), vol_note=vol_note,
+            avg5=vol.get("5日均量_亿", "____"), vol_5=vol_5,
+            up=rf.get("上涨", "____"), down=rf.get("下跌", "____"), ratio=ratio,
+        ),
+        _DRAFT_CORE.format(
+            zt=get("涨停家数", "____"), s_zt=dim.get("涨停家数", "____"),
+            seal=get("封板率", "____"), s_seal=dim.get("封板率", "____"),
+            premium=_or_nan(get("昨涨停溢价率", "____")), s_premium=_or_nan(dim.get("昨涨停溢价", "____")),
+            streak=get("最高连板", "____"), s_streak=dim.get("连板高度", "____"),
+            ratio=ratio, s_ratio=dim.get("涨跌比", "____"),
+            dt=get("跌停家数", "____"), s_dt=dim.get("跌停反指", "____"),
+            zb=get("炸板家数", "____"), today=score_today,
+        ),
+        "\n".join(f"| {t.get('板数', '')}板 | {t.get('家数', '')} 家 | {t.get('代表个股', '')} |"
+                  for t in tiers) if tiers else "| ____ | ____ 家 | |",
+        _DRAFT_CYCLE.format(prev2=score_prev2, prev1=score_prev1, today=score_today,
+                            trend=trend_3d, stage=get("情绪阶段", "____")),
     ]
 
-    dim = data_dict.get("情绪各维度", {})
-    lines.extend([
-        "| 指标 | 原始值 | 评分(1-10) | 评分参考 |",
-        "|------|--------|-----------|----------|",
-        f"| 涨停家数 | {data_dict.get('涨停家数', '____')} 家 | {dim.get('涨停家数', '____')} | <20→1-2 / 20-40→3-4 / ... |",
-        f"| 封板率 | {data_dict.get('封板率', '____')}% | {dim.get('封板率', '____')} | <40%→1-3 / ... |",
-        f"| 昨涨停今日溢价率 | {data_dict.get('昨涨停溢价率', '____')}% | {dim.get('昨涨停溢价', '____')} | <-5%→1 / ... |",
-        f"| 最高连板 | {data_dict.get('最高连板', '____')} 板 | {dim.get('连板高度', '____')} | 无→1 / 2板→3 / ... |",
-        f"| 涨跌比 | {rf.get('涨跌比', '____')} | {dim.get('涨跌比', '____')} | <0.3→1 / ... |",
-        f"| 跌停家数 | {data_dict.get('跌停家数', '____')} 家 | {dim.get('跌停反指', '____')} | >30→1 / ... |",
-        "",
-        "### 亏钱效应追踪",
-        "",
-        "| 指标 | 数值 | 说明 |",
-        "|------|------|------|",
-        "| 大面股数量 | ____ 家 | 昨日涨停/连板今日跌幅 > 5% 的个股 |",
-        "| 昨涨停大面比例 | ____% | 大面股 / 昨日涨停总数 |",
-        f"| 炸板股数量 | {data_dict.get('炸板家数', '____')} 家 | 盘中触及涨停但未封住 |",
-        "",
-        "### 情绪综合得分",
-        "",
-        f"**今日情绪得分：{score_today} 分**",
-        "",
-        "### 连板梯队分布",
-        "",
-        "| 板数 | 家数 | 代表个股 |",
-        "|------|------|----------|",
-    ])
+    lines.extend(f"| {i} | {ind.get('所属行业', '')} | {ind.get('涨停家数', '')} | {ind.get('代表个股', '')} |"
+                 for i, ind in enumerate(top3, 1))
+    lines.extend(["| ____ | | | |"] * (3 - len(top3)))
 
-    for t in data_dict.get("连板梯队", []):
-        lines.append(f"| {t.get('板数', '')}板 | {t.get('家数', '')} 家 | {t.get('代表个股', '')} |")
-    if not data_dict.get("连板梯队"):
-        lines.append("| ____ | ____ 家 | |")
+    # 量能异动未涨停
+    anomaly = data_dict.get("量能异动_未涨停") or []
+    n_anomaly = len(anomaly)
+    if n_anomaly:
+        lines.append(_DRAFT_ANOMALY_HEAD)
+        lines.append("\n".join(
+            f"| {s.get('名称', '')} | {_or_nan(s.get('涨跌幅', 0)):+.2f}% | {_or_nan(s.get('量比', ''))} "
+            f"| {_or_nan(s.get('换手率', ''))}% |"
+            for s in islice(anomaly, 20)))
+        if n_anomaly > 20:
+            lines.append(f"| ... 共 {n_anomaly} 只 | | | |")
+
+    lines.append(_DRAFT_TAIL)
+
+    out_path.write_text("\n".join(lines), encoding="utf-8")
+    return out_path
 
-    lines.extend([
-        "",
-        "---",
-        "",
-        "## 四、情绪周期定位",
-        "",
-        "### 得分走势",
-        "",
-        f"- **前日情绪得分**：{score_prev2} 分",
-        f"- **昨日情绪得分**：{score_prev1} 分",
-        f"- **今日情绪得分**：{score_today} 分",
-        f"- **3日趋势**：{trend_3d}",
-        "",
-        "### 当前所处周期阶段",
-        "",
-        f"- 当前阶段：{data_dict.get('情绪阶段', '____')}",
-        "",
-        "---",
-        "",
-        "## 五、龙头梳理",
-        "",
-        "（请根据盘面补充：总龙头、补涨龙、前排助攻、龙头演进判断）",
-        "",
-        "---",
-        "",
-        "## 六、题材板块分析",
-        "",
-        "### 当日最强题材 TOP3",
-        "",
-        "| 排名 | 题材名称 | 涨停家数 | 代表个股 |",
-        "|------|----------|----------|----------|",
-    ])
 
-    for i, ind in enumerate(data_dict.get("涨停行业TOP5", [])[:3], 1):
-        lines.append(f"| {i} | {ind.get('所属行业', '')} | {ind.get('涨停家数', '')} | {ind.get('代表个股', '')} |")
-    for _ in range(3 - len(data_dict.get("涨停行业TOP5", [])[:3])):
-        lines.append("| ____ | | | |")
+def generate_drafts(records: list[dict]):
+    """为 collect_batch 返回的各日数据生成复盘草稿，直接复用内存中的数据，不再回读 JSON。
 
-    # 量能异动未涨停
-    anomaly = data_dict.get("量能异动_未涨停", [])
-    if anomaly:
-        lines.extend([
-            "",
-            "### 量能异动（未涨停）",
-            "",
-            "| 名称 | 涨跌幅 | 量比 | 换手率 |",
-            "|------|--------|------|--------|",
-        ])
-        for s in anomaly[:20]:
-            lines.append(f"| {s.get('名称', '')} | {s.get('涨跌幅', 0):+.2f}% | {s.get('量比', '')} | {s.get('换手率', '')}% |")
-        if len(anomaly) > 20:
-            lines.append(f"| ... 共 {len(anomaly)} 只 | | | |")
-
-    lines.extend([
-        "",
-        "---",
-        "",
-        "## 七、五日线低吸跟踪",
-        "",
-        "（请根据盘面补充：低吸候选池）",
-        "",
-        "---",
-        "",
-        "## 八、持仓管理",
-        "",
-        "（请补充：当前持仓、明日操作计划）",
-        "",
-        "---",
-        "",
-        "## 九、明日策略",
-        "",
-        "（请根据复盘结论补充：情景预案、竞价策略、仓位计划、关注方向、风险提示）",
-        "",
-        "---",
-        "",
-        "## 十、交易纪律自检",
-        "",
-        "（请补充：今日操作回顾、纪律检查）",
-        "",
-        "---",
-        "",
-        "> **本稿由脚本自动生成，请在此基础上补充主观判断与操作计划。**",
-        "",
-    ])
+    每份草稿约 1ms，串行即可；进程池的启动与（spawn 下）重新 import 的开销远大于生成本身。"""
+    for data in records:
+        print(f"  草稿: {generate_draft_review(data['日期'], data)}")
 
-    md = "\n".join(lines)
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(md)
-    return out_path
 
 def print_report(data: dict):
     d = data["日期"]
@@ -1014,8 +1376,8 @@ def print_report(data: dict):
     if isinstance(idx, dict):
         for name, v in idx.items():
             if isinstance(v, dict) and "收盘" in v:
-                print(f"  {name}: {v['收盘']} 点（{v['涨跌幅']:+.2f}%）")
-    print(f"  两市成交额: {data['两市成交额_亿']:.0f} 亿")
+                print(f"  {name}: {_or_nan(v['收盘'])} 点（{_or_nan(v['涨跌幅']):+.2f}%）")
+    print(f"  两市成交额: {_or_nan(data['两市成交额_亿']):.0f} 亿")
     va = data.get("量能分析", {})
     if va.get("日环比%") is not None:
         label = "放量" if va["日环比%"] > 0 else "缩量"
@@ -1031,61 +1393,54 @@ def print_report(data: dict):
     print("\n【二、情绪核心数据】")
     print(f"  涨停: {data['涨停家数']} 家 | 炸板: {data['炸板家数']} 家 | 封板率: {data['封板率']}%")
     print(f"  跌停: {data['跌停家数']} 家")
-    print(f"  昨涨停溢价率: {data['昨涨停溢价率']:+.2f}%")
+    print(f"  昨涨停溢价率: {_or_nan(data['昨涨停溢价率']):+.2f}%")
     print(f"  最高连板: {data['最高连板']} 板")
-    print(f"  ★ 情绪综合得分: {data['情绪综合得分']} 分")
+    print(f"  ★ 情绪综合得分: {_or_nan(data['情绪综合得分'])} 分")
     print(f"  ★ 当前阶段: {data['情绪阶段']}")
 
-    if data.get("连板梯队"):
+    tiers = data.get("连板梯队") or []
+    if tiers:
         print("\n【三、连板梯队】")
-        for t in data["连板梯队"]:
-            print(f"  {t['板数']}板: {t['家数']}家 → {t['代表个股']}")
+        print("\n".join(f"  {t['板数']}板: {t['家数']}家 → {t['代表个股']}" for t in tiers))
 
     if data.get("连板股明细"):
         print("\n【四、连板股盘口明细】")
-        for s in data["连板股明细"]:
-            name = s.get("名称", "?")
-            streak = s.get("连板数", "?")
-            btype = s.get("板型", "?")
-            fs = s.get("首次封板时间", "")
-            ls = s.get("最后封板时间", "")
-            seal_money = s.get("封板资金", 0)
-            seal_yi = round(seal_money / 1e8, 1) if seal_money else 0
-            turnover = s.get("换手率", "")
-            amplitude = s.get("振幅", "")
-            line = f"  {name}({streak}板) [{btype}] 首封{fs} 末封{ls} 封单{seal_yi}亿"
-            if turnover:
-                line += f" 换手{turnover}%"
-            if amplitude:
-                line += f" 振幅{amplitude}%"
-            print(line)
-
-    if data.get("涨停行业TOP5"):
+        print("\n".join(
+            f"  {s.get('名称', '?')}({s.get('连板数', '?')}板) [{s.get('板型', '?')}] "
+            f"首封{s.get('首次封板时间', '')} 末封{s.get('最后封板时间', '')} "
+            f"封单{(s.get('封板资金') or 0) / 1e8:.1f}亿"
+            f"{f' 换手{tr}%' if (tr := s.get('换手率')) else ''}"
+            f"{f' 振幅{amp}%' if (amp := s.get('振幅')) else ''}"
+            for s in data["连板股明细"]))
+
+    top_industries = data.get("涨停行业TOP5") or []
+    if top_industries:
         print("\n【五、涨停行业 TOP5】")
-        for i, ind in enumerate(data["涨停行业TOP5"], 1):
-            print(f"  {i}. {ind['所属行业']}（{ind['涨停家数']}家涨停）→ {ind['代表个股']}")
+        print("\n".join(f"  {i}. {ind['所属行业']}（{ind['涨停家数']}家涨停）→ {ind['代表个股']}"
+                        for i, ind in enumerate(top_industries, 1)))
 
-    if data.get("量能异动_未涨停"):
+    anomaly = data.get("量能异动_未涨停") or []
+    n_anomaly = len(anomaly)
+    if n_anomaly:
         print("\n【六、量能异动（未涨停）】")
-        for s in data["量能异动_未涨停"][:15]:
-            print(f"  {s.get('名称', '?')} 涨跌幅{s.get('涨跌幅', 0):+.2f}% 量比{s.get('量比', 0)} 换手{s.get('换手率', 0)}%")
-        if len(data["量能异动_未涨停"]) > 15:
-            print(f"  ... 共 {len(data['量能异动_未涨停'])} 只（量比≥{VOLUME_ANOMALY_LIANGBI_MIN}）")
+        print("\n".join(f"  {s.get('名称', '?')} 涨跌幅{_or_nan(s.get('涨跌幅', 0)):+.2f}% "
+                        f"量比{_or_nan(s.get('量比', 0))} 换手{_or_nan(s.get('换手率', 0))}%"
+                        for s in islice(anomaly, 15)))
+        if n_anomaly > 15:
+            print(f"  ... 共 {n_anomaly} 只（量比≥{VOLUME_ANOMALY_LIANGBI_MIN}）")
 
     print(f"\n{'='*60}\n")
 
 
-def _save_json(data: dict, date_str: str):
-    DATA_DIR.mkdir(exist_ok=True)
+def _save_json(data: dict, date_str: str, header_entries: dict | None = None):
+    """保存当日 JSON 并更新汇总索引；传入 header_entries 时只收集条目，由调用方最后统一写回。"""
     out_file = DATA_DIR / f"{date_str}.json"
-    def ser(obj):
-        if isinstance(obj, pd.DataFrame): return obj.to_dict(orient="records")
-        if isinstance(obj, (pd.Timestamp, datetime)): return str(obj)
-        if hasattr(obj, "item"): return obj.item()
-        return obj
-    clean = json.loads(json.dumps(data, default=ser, ensure_ascii=False))
-    with open(out_file, "w", encoding="utf-8") as f:
-        json.dump(clean, f, ensure_ascii=False, indent=2)
+    _write_json(out_file, data)
+    entry = _summary_header_entry(data, out_file)
+    if header_entries is None:
+        _update_summary_headers({date_str: entry})
+    else:
+        header_entries[date_str] = entry
 
 
 # ---------------------------------------------------------------------------
@@ -1101,11 +1456,12 @@ def parse_args():
     parser.add_argument("date", nargs="?", help="单日采集日期（YYYYMMDD）")
     parser.add_argument("--range", nargs=2, metavar=("START", "END"), help="批量采集日期范围")
     parser.add_argument("--days", type=int, help="采集最近 N 个交易日")
-    parser.add_argument("--force", action="store_true", help="强制重新采集（忽略缓存）")
+    parser.add_argument("--force", action="store_true", help="强制重新采集（忽略缓存；单日模式下重新请求股池接口）")
     parser.add_argument("--summary", action="store_true", help="生成周期汇总报告")
     parser.add_argument("--no-draft", dest="draft", action="store_false", default=True,
                         help="不生成复盘草稿（单日/批量均可生成草稿时默认生成）")
     parser.add_argument("--print-only", action="store_true", help="仅打印，不保存文件")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不打印单日控制台报告（定时任务等无人查看时使用）")
     return parser.parse_args()
 
 
@@ -1120,15 +1476,11 @@ def main():
             print(f"❌ {start} ~ {end} 范围内无交易日")
             return
         print(f"📅 日期范围 {start} ~ {end}，共 {len(dates)} 个交易日\n")
-        collect_batch(dates, force=args.force)
+        results = collect_batch(dates, force=args.force)
         if args.summary:
             generate_summary(dates, DATA_DIR)
         if args.draft:
-            for d in dates:
-                loaded = _load_single(d)
-                if loaded:
-                    p = generate_draft_review(d, loaded)
-                    print(f"  草稿: {p}")
+            generate_drafts(results)
         return
 
     # 批量模式: --days
@@ -1138,15 +1490,11 @@ def main():
             print(f"❌ 无法确定最近 {args.days} 个交易日")
             return
         print(f"📅 最近 {args.days} 个交易日: {dates[0]} ~ {dates[-1]}\n")
-        collect_batch(dates, force=args.force)
+        results = collect_batch(dates, force=args.force)
         if args.summary:
             generate_summary(dates, DATA_DIR)
         if args.draft:
-            for d in dates:
-                loaded = _load_single(d)
-                if loaded:
-                    p = generate_draft_review(d, loaded)
-                    print(f"  草稿: {p}")
+            generate_drafts(results)
         return
 
     # 单日模式
@@ -1156,9 +1504,11 @@ def main():
     else:
         date_str = get_recent_trading_days(1)[0]
     print(f"📊 正在采集 {date_str} 的复盘数据...\n")
-    data = collect_single(date_str, use_realtime=True)
-    print_report(data)
+    data = collect_single(date_str, use_realtime=True, refresh=args.force)
+    if not args.quiet or args.print_only:
+        print_report(data)
     if not args.print_only:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
         _save_json(data, date_str)
         print(f"✅ 原始数据已保存至: {DATA_DIR / f'{date_str}.json'}")
         if args.draft: